@@ -1,17 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 from PIL import Image
 import io
 import template
 from datetime import datetime
 import faiss
-import pickle
+import pyarrow as pa
+import pyarrow.parquet as pq
 import os
+import platform
 from pathlib import Path
 import logging
+import re
 import cv2
+from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,19 +33,167 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# (key, label) pairs checked in priority order: the first non-negated condition wins
+_POSITIVE_CONDITIONS = (
+    ("emphysema", "Emphysema"), ("pneumonia", "Pneumonia"), ("pleural effusion", "Pleural Effusion"),
+    ("atelectasis", "Atelectasis"), ("cardiomegaly", "Cardiomegaly"), ("pulmonary edema", "Pulmonary Edema"),
+    ("pneumothorax", "Pneumothorax"), ("consolidation", "Consolidation"), ("fibrosis", "Fibrosis"),
+    ("nodule", "Nodule"), ("mass", "Mass"), ("fracture", "Fracture"), ("tuberculosis", "Tuberculosis"),
+    ("covid-19", "COVID-19"), ("bronchitis", "Bronchitis"), ("lung cancer", "Lung Cancer"),
+    ("pulmonary embolism", "Pulmonary Embolism"), ("interstitial markings", "Interstitial Disease"),
+    ("hyperinflated", "Emphysema"), ("hyperlucency", "Emphysema"), ("enlarged heart", "Cardiomegaly"),
+    ("cardiac silhouette is enlarged", "Cardiomegaly")
+)
+_NEGATION_RE = re.compile("no |without |absence of|rule out|r/o")
+_EXPLICIT_NORMAL_PATTERNS = ("normal chest", "clear lungs", "unremarkable", "no acute", "no active disease", "within normal limits")
+_NEGATIVE_ONLY_PATTERNS = ("no pneumonia", "no consolidation", "no pleural effusion", "no pneumothorax", "no mass", "no nodules", "no fracture")
+
+# Professional report templates based on disease
+_REPORT_TEMPLATES = {k: v.strip() for k, v in {
+    "Normal Findings": """
+            IMPRESSION: Normal chest radiographic examination.
+            
+            FINDINGS: The lungs demonstrate clear bilateral fields with normal pulmonary vascularity. 
+            Cardiac silhouette appears within normal limits. Mediastinal contours are unremarkable. 
+            No evidence of pneumothorax, pleural effusion, or focal consolidation. 
+            Bony structures and soft tissues appear intact without acute abnormality.
+            
+            ASSESSMENT: No acute cardiopulmonary abnormalities identified on this chest radiograph.
+            """,
+    
+    "Pneumonia": """
+            IMPRESSION: Findings consistent with pneumonia.
+            
+            FINDINGS: Areas of increased opacity and consolidation are identified, suggesting acute inflammatory 
+            process within the pulmonary parenchyma. Patchy infiltrates may be present with associated 
+            air bronchograms. Cardiac silhouette and mediastinal structures evaluated within the context 
+            of the inflammatory process.
+            
+            ASSESSMENT: Radiographic features support clinical suspicion of pneumonia. 
+            Correlation with clinical symptoms and laboratory findings recommended.
+            """,
+    
+    "Pleural Effusion": """
+            IMPRESSION: Pleural effusion identified.
+            
+            FINDINGS: Fluid collection within the pleural space demonstrating characteristic meniscus sign 
+            and blunting of costophrenic angles. The degree of effusion and impact on adjacent lung 
+            expansion is noted. Cardiac and mediastinal structures assessed for displacement or compression.
+            
+            ASSESSMENT: Pleural effusion present. Clinical correlation recommended to determine underlying etiology 
+            and guide appropriate management.
+            """,
+    
+    "Cardiomegaly": """
+            IMPRESSION: Cardiac enlargement identified.
+            
+            FINDINGS: Cardiac silhouette demonstrates increased size with cardiothoracic ratio suggesting 
+            cardiomegaly. Pulmonary vascularity patterns evaluated for signs of congestion or redistribution. 
+            Lung fields assessed for associated findings such as pulmonary edema or effusions.
+            
+            ASSESSMENT: Cardiomegaly noted. Clinical correlation with echocardiography and cardiac evaluation 
+            recommended for further assessment.
+            """,
+    
+    "Pneumothorax": """
+            IMPRESSION: Pneumothorax identified.
+            
+            FINDINGS: Air collection within the pleural space demonstrating visceral pleural line separation 
+            from chest wall. The extent and degree of lung collapse assessed. Mediastinal structures 
+            evaluated for potential shift or tension components.
+            
+            ASSESSMENT: Pneumothorax present. Immediate clinical attention recommended based on size and 
+            patient symptoms to determine appropriate intervention.
+            """,
+    
+    "Atelectasis": """
+            IMPRESSION: Atelectasis identified.
+            
+            FINDINGS: Areas of volume loss and increased opacity consistent with collapse of lung segments 
+            or lobes. Compensatory changes in adjacent structures noted. Evaluation for potential 
+            underlying causes such as obstruction or compression performed.
+            
+            ASSESSMENT: Atelectasis present. Further evaluation may be warranted to determine underlying 
+            cause and guide treatment approach.
+            """,
+    
+    "Emphysema": """
+            IMPRESSION: Changes consistent with emphysema.
+            
+            FINDINGS: Hyperinflation of lung fields with flattened diaphragms and increased anteroposterior 
+            chest diameter. Pulmonary vascularity appears attenuated with characteristic hyperlucency. 
+            Cardiac silhouette may appear elongated due to positional changes.
+            
+            ASSESSMENT: Radiographic features consistent with emphysematous changes. 
+            Pulmonary function testing and clinical correlation recommended.
+            """,
+    
+    "Radiographic Abnormality": """
+            IMPRESSION: Radiographic abnormality identified requiring further evaluation.
+            
+            FINDINGS: Abnormal radiographic features are present that warrant additional investigation. 
+            The findings demonstrate characteristics that deviate from normal chest radiographic anatomy. 
+            Further imaging or clinical correlation may be beneficial for definitive characterization.
+            
+            ASSESSMENT: Abnormal radiographic findings identified. Additional imaging studies or 
+            clinical evaluation recommended for comprehensive assessment and diagnosis.
+            """
+}.items()}
+
+@lru_cache(maxsize=1024)
+def _encode_queries(model, query_texts):
+    # Cached as bytes so callers can't mutate a shared array
+    query_embeddings = model.encode(list(query_texts), convert_to_numpy=True, normalize_embeddings=True)
+    return query_embeddings.astype('float32', copy=False).tobytes()
+
+def _classify_report(report_text: str) -> str:
+    report_lower = str(report_text).lower()
+    
+    for condition_key, condition_name in _POSITIVE_CONDITIONS:
+        condition_pos = report_lower.find(condition_key)
+        if condition_pos != -1:
+            is_negated = _NEGATION_RE.search(report_lower, max(0, condition_pos-20), condition_pos) is not None
+            if not is_negated:
+                return condition_name
+    
+    has_explicit_normal = any(pattern in report_lower for pattern in _EXPLICIT_NORMAL_PATTERNS)
+    negative_count = sum(1 for pattern in _NEGATIVE_ONLY_PATTERNS if pattern in report_lower)
+    
+    if has_explicit_normal or negative_count >= 2:
+        return "Normal Findings"
+    
+    return "Radiographic Abnormality"
+
 class FastRAGSystem:
-    def __init__(self, csv_path="Data\cxr_df.csv", index_path="Data/faiss_index.bin", metadata_path="Data/metadata.pkl"):
+    def __init__(self, csv_path="Data\cxr_df.csv", index_path="Data/faiss_index.bin", metadata_path="Data/metadata.npz", reports_path="Data/reports.parquet", embeddings_path="Data/embeddings.npy"):
         self.csv_path = csv_path
         self.index_path = index_path
         self.metadata_path = metadata_path
+        self.reports_path = reports_path
+        self.embeddings_path = embeddings_path
         self.embedding_model = None
         self.faiss_index = None
         self.metadata = None
         self.df = None
+        self.nprobe = 32
+        # Half the cores for FAISS's OpenMP scans, leaving the rest to the tokenizer/encoder
+        faiss.omp_set_num_threads(max(1, (os.cpu_count() or 2) // 2))
         
     @st.cache_resource
     def load_embedding_model(_self):
-        return SentenceTransformer('all-MiniLM-L6-v2')
+        if torch.cuda.is_available():
+            model = SentenceTransformer('all-MiniLM-L6-v2', device='cuda')
+            model.half()
+            return model
+        # On CPU run the INT8-quantized ONNX export through onnxruntime instead of torch,
+        # using the arm64 build on ARM hosts; without the onnx extras stay on torch
+        onnx_file = 'onnx/model_qint8_arm64.onnx' if platform.machine().lower() in ('arm64', 'aarch64') else 'onnx/model_quint8_avx2.onnx'
+        try:
+            return SentenceTransformer('all-MiniLM-L6-v2', device='cpu', backend='onnx',
+                                       model_kwargs={'file_name': onnx_file})
+        except Exception as e:
+            logger.warning(f"ONNX backend unavailable ({e}), falling back to torch")
+            return SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
     
     @st.cache_data
     def load_dataset(_self):
@@ -67,7 +220,7 @@ class FastRAGSystem:
             return pd.DataFrame({'id': ['1'], 'text': ['Sample chest X-ray report showing normal findings']})
     
     def build_faiss_index(self, force_rebuild=False):
-        if not force_rebuild and os.path.exists(self.index_path) and os.path.exists(self.metadata_path):
+        if not force_rebuild and self.index_files_exist():
             return self.load_faiss_index()
         
         logger.info("Building FAISS index...")
@@ -76,39 +229,54 @@ class FastRAGSystem:
         if self.embedding_model is None:
             self.embedding_model = self.load_embedding_model()
         
-        batch_size = 100
-        embeddings = []
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i in range(0, len(df), batch_size):
-            batch = df['text'].iloc[i:i+batch_size].fillna('').tolist()
-            batch_embeddings = self.embedding_model.encode(batch, show_progress_bar=False)
-            embeddings.extend(batch_embeddings)
+        # Encode in length order so each batch pads to similar lengths; every chunk of
+        # the sorted order is written straight into its rows of a preallocated buffer
+        texts = df['text'].fillna('').to_numpy(dtype=object)
+        order = np.argsort(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)), kind='stable')
+        dimension = self.embedding_model.get_sentence_embedding_dimension()
+        embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+        
+        chunk_size = 128 * 40
+        for i in range(0, len(texts), chunk_size):
+            chunk = order[i:i+chunk_size]
+            embeddings[chunk] = self.embedding_model.encode(
+                texts[chunk].tolist(), batch_size=128, convert_to_tensor=True,
+                normalize_embeddings=True, show_progress_bar=False
+            ).float().cpu().numpy()
             
-            progress = min((i + batch_size) / len(df), 1.0)
-            progress_bar.progress(progress)
-            status_text.text(f"Processing embeddings: {i+batch_size}/{len(df)}")
-        
-        embeddings = np.array(embeddings).astype('float32')
-        dimension = embeddings.shape[1]
-        index = faiss.IndexFlatIP(dimension)
-        faiss.normalize_L2(embeddings)
+            done = min(i + chunk_size, len(texts))
+            progress_bar.progress(done / len(texts))
+            status_text.text(f"Processing embeddings: {done}/{len(texts)}")
+        
+        # HNSW for small corpora; OPQ-rotated IVF+PQ (32 bytes/vector) once exhaustive
+        # search and fp32 storage get expensive
+        if len(embeddings) < 50000:
+            index = faiss.IndexHNSWFlat(dimension, 32, faiss.METRIC_INNER_PRODUCT)
+        else:
+            nlist = int(4 * np.sqrt(len(embeddings)))
+            index = faiss.index_factory(dimension, f"OPQ32,IVF{nlist},PQ32", faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
         index.add(embeddings)
+        self.set_nprobe(index)
         
         os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
         faiss.write_index(index, self.index_path)
-        
-        metadata = {
-            'reports': df['text'].tolist(),
-            'ids': df['id'].tolist(),
-            'diseases': [self.extract_disease_name(text) for text in df['text']],
-            'dimension': dimension,
-            'total_records': len(df)
-        }
-        
-        with open(self.metadata_path, 'wb') as f:
-            pickle.dump(metadata, f)
+        # Normalized embeddings at half precision, for exact re-scoring of IVF-PQ hits
+        np.save(self.embeddings_path, embeddings.astype(np.float16))
+        
+        # Columnar metadata: fixed-width id/disease arrays plus an Arrow column of reports
+        np.savez(
+            self.metadata_path,
+            ids=df['id'].to_numpy(dtype=str),
+            diseases=np.fromiter(map(_classify_report, texts), dtype='U32', count=len(texts)),
+            dimension=dimension,
+            total_records=len(df)
+        )
+        pq.write_table(pa.table({'report': pa.array(texts, type=pa.string())}), self.reports_path)
+        metadata = self.read_metadata()
         
         progress_bar.empty()
         status_text.empty()
@@ -118,178 +286,99 @@ class FastRAGSystem:
         self.metadata = metadata
         return index, metadata
     
+    def index_files_exist(self):
+        return all(os.path.exists(path) for path in (self.index_path, self.metadata_path, self.reports_path, self.embeddings_path))
+    
+    def read_metadata(self):
+        with np.load(self.metadata_path) as data:
+            metadata = {
+                'ids': data['ids'],
+                'diseases': pd.Categorical(data['diseases']),
+                'dimension': int(data['dimension']),
+                'total_records': int(data['total_records'])
+            }
+        metadata['reports'] = pq.read_table(self.reports_path, memory_map=True).column('report')
+        metadata['embeddings'] = np.load(self.embeddings_path, mmap_mode='r')
+        return metadata
+    
+    def set_nprobe(self, index):
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            ivf_index.nprobe = self.nprobe
+    
     @st.cache_resource
     def load_faiss_index(_self):
         try:
-            index = faiss.read_index(_self.index_path)
-            with open(_self.metadata_path, 'rb') as f:
-                metadata = pickle.load(f)
+            try:
+                # Map the index file instead of reading it all into RAM
+                index = faiss.read_index(_self.index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                index = faiss.read_index(_self.index_path)
+            _self.set_nprobe(index)
+            metadata = _self.read_metadata()
             logger.info(f"Loaded FAISS index with {metadata['total_records']} records")
             return index, metadata
         except Exception as e:
             logger.error(f"Error loading FAISS index: {e}")
             return None, None
     
-    def search_similar_reports(self, query_text, k=5):
+    def search_similar_reports_batch(self, query_texts, k=5):
         if self.faiss_index is None or self.metadata is None:
-            return []
+            return [[] for _ in query_texts]
         
         if self.embedding_model is None:
             self.embedding_model = self.load_embedding_model()
         
-        query_embedding = self.embedding_model.encode([query_text]).astype('float32')
-        faiss.normalize_L2(query_embedding)
-        scores, indices = self.faiss_index.search(query_embedding, k)
-        
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < len(self.metadata['reports']):
-                results.append({
-                    'report': self.metadata['reports'][idx],
-                    'id': self.metadata['ids'][idx],
-                    'disease': self.metadata['diseases'][idx],
-                    'similarity_score': float(score)
-                })
-        return results
+        # One forward pass and one FAISS call for every query in the batch
+        query_embeddings = np.frombuffer(
+            _encode_queries(self.embedding_model, tuple(query_texts)), dtype='float32'
+        ).reshape(len(query_texts), -1).copy()
+        scores, indices = self.faiss_index.search(query_embeddings, k)
+        if faiss.try_extract_index_ivf(self.faiss_index) is not None:
+            scores, indices = self.rescore_exact(query_embeddings, indices)
+        
+        batch_results = []
+        for query_scores, query_indices in zip(scores, indices):
+            results = []
+            for score, idx in zip(query_scores, query_indices):
+                if 0 <= idx < len(self.metadata['reports']):
+                    results.append({
+                        'report': self.metadata['reports'][idx].as_py(),
+                        'id': self.metadata['ids'][idx],
+                        'disease': self.metadata['diseases'][idx],
+                        'similarity_score': float(score)
+                    })
+            batch_results.append(results)
+        return batch_results
     
-    def extract_disease_name(self, report_text: str) -> str:
-        report_lower = str(report_text).lower()
-        
-        positive_conditions = {
-            "emphysema": "Emphysema", "pneumonia": "Pneumonia", "pleural effusion": "Pleural Effusion",
-            "atelectasis": "Atelectasis", "cardiomegaly": "Cardiomegaly", "pulmonary edema": "Pulmonary Edema",
-            "pneumothorax": "Pneumothorax", "consolidation": "Consolidation", "fibrosis": "Fibrosis",
-            "nodule": "Nodule", "mass": "Mass", "fracture": "Fracture", "tuberculosis": "Tuberculosis",
-            "covid-19": "COVID-19", "bronchitis": "Bronchitis", "lung cancer": "Lung Cancer",
-            "pulmonary embolism": "Pulmonary Embolism", "interstitial markings": "Interstitial Disease",
-            "hyperinflated": "Emphysema", "hyperlucency": "Emphysema", "enlarged heart": "Cardiomegaly",
-            "cardiac silhouette is enlarged": "Cardiomegaly"
-        }
-        
-        for condition_key, condition_name in positive_conditions.items():
-            if condition_key in report_lower:
-                condition_pos = report_lower.find(condition_key)
-                text_before = report_lower[max(0, condition_pos-20):condition_pos]
-                negation_words = ["no ", "without ", "absence of", "rule out", "r/o"]
-                is_negated = any(neg in text_before for neg in negation_words)
-                if not is_negated:
-                    return condition_name
-        
-        explicit_normal_patterns = ["normal chest", "clear lungs", "unremarkable", "no acute", "no active disease", "within normal limits"]
-        has_explicit_normal = any(pattern in report_lower for pattern in explicit_normal_patterns)
-        
-        negative_only_patterns = ["no pneumonia", "no consolidation", "no pleural effusion", "no pneumothorax", "no mass", "no nodules", "no fracture"]
-        negative_count = sum(1 for pattern in negative_only_patterns if pattern in report_lower)
-        
-        if has_explicit_normal or negative_count >= 2:
-            return "Normal Findings"
-        
-        return "Radiographic Abnormality"
+    def rescore_exact(self, query_embeddings, indices):
+        # IVF-PQ scores only approximate the inner product, and similarity_score is
+        # compared against fixed thresholds (0.7 for case insights, 0.8/0.5 for the
+        # confidence colour), so re-score the k hits against their stored embeddings
+        # and re-rank them; empty slots (-1) sort last and are dropped by the caller
+        valid = indices >= 0
+        rows = self.metadata['embeddings'][np.where(valid, indices, 0).ravel()]
+        rows = rows.astype(np.float32).reshape(*indices.shape, -1)
+        scores = np.einsum('qkd,qd->qk', rows, query_embeddings)
+        scores[~valid] = -np.inf
+        order = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(indices, order, axis=1)
+    
+    def search_similar_reports(self, query_text, k=5):
+        return self.search_similar_reports_batch([query_text], k)[0]
 
     def generate_professional_report(self, disease_name: str, similar_cases: list) -> str:
         """Generate professional AI report based on primary finding"""
         
-        # Professional report templates based on disease
-        report_templates = {
-            "Normal Findings": """
-            IMPRESSION: Normal chest radiographic examination.
-            
-            FINDINGS: The lungs demonstrate clear bilateral fields with normal pulmonary vascularity. 
-            Cardiac silhouette appears within normal limits. Mediastinal contours are unremarkable. 
-            No evidence of pneumothorax, pleural effusion, or focal consolidation. 
-            Bony structures and soft tissues appear intact without acute abnormality.
-            
-            ASSESSMENT: No acute cardiopulmonary abnormalities identified on this chest radiograph.
-            """,
-            
-            "Pneumonia": """
-            IMPRESSION: Findings consistent with pneumonia.
-            
-            FINDINGS: Areas of increased opacity and consolidation are identified, suggesting acute inflammatory 
-            process within the pulmonary parenchyma. Patchy infiltrates may be present with associated 
-            air bronchograms. Cardiac silhouette and mediastinal structures evaluated within the context 
-            of the inflammatory process.
-            
-            ASSESSMENT: Radiographic features support clinical suspicion of pneumonia. 
-            Correlation with clinical symptoms and laboratory findings recommended.
-            """,
-            
-            "Pleural Effusion": """
-            IMPRESSION: Pleural effusion identified.
-            
-            FINDINGS: Fluid collection within the pleural space demonstrating characteristic meniscus sign 
-            and blunting of costophrenic angles. The degree of effusion and impact on adjacent lung 
-            expansion is noted. Cardiac and mediastinal structures assessed for displacement or compression.
-            
-            ASSESSMENT: Pleural effusion present. Clinical correlation recommended to determine underlying etiology 
-            and guide appropriate management.
-            """,
-            
-            "Cardiomegaly": """
-            IMPRESSION: Cardiac enlargement identified.
-            
-            FINDINGS: Cardiac silhouette demonstrates increased size with cardiothoracic ratio suggesting 
-            cardiomegaly. Pulmonary vascularity patterns evaluated for signs of congestion or redistribution. 
-            Lung fields assessed for associated findings such as pulmonary edema or effusions.
-            
-            ASSESSMENT: Cardiomegaly noted. Clinical correlation with echocardiography and cardiac evaluation 
-            recommended for further assessment.
-            """,
-            
-            "Pneumothorax": """
-            IMPRESSION: Pneumothorax identified.
-            
-            FINDINGS: Air collection within the pleural space demonstrating visceral pleural line separation 
-            from chest wall. The extent and degree of lung collapse assessed. Mediastinal structures 
-            evaluated for potential shift or tension components.
-            
-            ASSESSMENT: Pneumothorax present. Immediate clinical attention recommended based on size and 
-            patient symptoms to determine appropriate intervention.
-            """,
-            
-            "Atelectasis": """
-            IMPRESSION: Atelectasis identified.
-            
-            FINDINGS: Areas of volume loss and increased opacity consistent with collapse of lung segments 
-            or lobes. Compensatory changes in adjacent structures noted. Evaluation for potential 
-            underlying causes such as obstruction or compression performed.
-            
-            ASSESSMENT: Atelectasis present. Further evaluation may be warranted to determine underlying 
-            cause and guide treatment approach.
-            """,
-            
-            "Emphysema": """
-            IMPRESSION: Changes consistent with emphysema.
-            
-            FINDINGS: Hyperinflation of lung fields with flattened diaphragms and increased anteroposterior 
-            chest diameter. Pulmonary vascularity appears attenuated with characteristic hyperlucency. 
-            Cardiac silhouette may appear elongated due to positional changes.
-            
-            ASSESSMENT: Radiographic features consistent with emphysematous changes. 
-            Pulmonary function testing and clinical correlation recommended.
-            """,
-            
-            "Radiographic Abnormality": """
-            IMPRESSION: Radiographic abnormality identified requiring further evaluation.
-            
-            FINDINGS: Abnormal radiographic features are present that warrant additional investigation. 
-            The findings demonstrate characteristics that deviate from normal chest radiographic anatomy. 
-            Further imaging or clinical correlation may be beneficial for definitive characterization.
-            
-            ASSESSMENT: Abnormal radiographic findings identified. Additional imaging studies or 
-            clinical evaluation recommended for comprehensive assessment and diagnosis.
-            """
-        }
-        
         # Get base template or default
-        base_report = report_templates.get(disease_name, report_templates["Radiographic Abnormality"])
+        base_report = _REPORT_TEMPLATES.get(disease_name, _REPORT_TEMPLATES["Radiographic Abnormality"])
         
         # Enhance with similar case insights if available
         if similar_cases and len(similar_cases) > 0:
             # Extract key findings from similar cases
             similar_findings = []
             for case in similar_cases[:2]:  # Use top 2 similar cases
-                case_disease = self.extract_disease_name(case['report'])
+                case_disease = case['disease']
                 if case_disease == disease_name and case['similarity_score'] > 0.7:
                     # Extract key phrases from similar reports
                     report_text = case['report'].lower()
@@ -302,12 +391,13 @@ class FastRAGSystem:
             
             # Add clinical correlation note if similar findings found
             if similar_findings:
-                additional_note = f"\n\nCLINICAL CORRELATION: Based on similar radiographic patterns, " + \
-                               f"findings may demonstrate {', '.join(similar_findings)}. " + \
-                               f"Correlation with patient history and clinical presentation recommended."
-                base_report += additional_note
+                base_report = (
+                    f"{base_report}\n\nCLINICAL CORRELATION: Based on similar radiographic patterns, "
+                    f"findings may demonstrate {', '.join(similar_findings)}. "
+                    f"Correlation with patient history and clinical presentation recommended."
+                )
         
-        return base_report.strip()
+        return base_report
 
 @st.cache_resource
 def get_rag_system():
@@ -318,19 +408,26 @@ def process_image_with_rag(uploaded_image, rag_system):
         image = Image.open(uploaded_image).resize((224, 224)).convert('L')
         image_array = np.array(image, dtype=np.uint8)
         
-        brightness = np.mean(image_array)
-        contrast = np.std(image_array)
+        mean, stddev = cv2.meanStdDev(image_array)
+        brightness = mean[0, 0]
+        contrast = stddev[0, 0]
         
         edges = cv2.Canny(image_array, 100, 200)
-        edge_density = np.sum(edges) / (224 * 224 * 255)
+        edge_density = cv2.countNonZero(edges) / (224 * 224)
         
+        # Quadrant means from one summed-area table instead of four slice reductions
         h, w = image_array.shape
         mid_h, mid_w = h // 2, w // 2
+        sat = cv2.integral(image_array)
+        
+        def region_mean(r0, c0, r1, c1):
+            return (sat[r1, c1] - sat[r0, c1] - sat[r1, c0] + sat[r0, c0]) / ((r1 - r0) * (c1 - c0))
+        
         regional_means = {
-            'top_left': np.mean(image_array[:mid_h, :mid_w]),
-            'top_right': np.mean(image_array[:mid_h, mid_w:]),
-            'bottom_left': np.mean(image_array[mid_h:, :mid_w]),
-            'bottom_right': np.mean(image_array[mid_h:, mid_w:])
+            'top_left': region_mean(0, 0, mid_h, mid_w),
+            'top_right': region_mean(0, mid_w, mid_h, w),
+            'bottom_left': region_mean(mid_h, 0, h, mid_w),
+            'bottom_right': region_mean(mid_h, mid_w, h, w)
         }
         
         left_lung_mean = (regional_means['top_left'] + regional_means['bottom_left']) / 2
@@ -371,7 +468,7 @@ def process_image_with_rag(uploaded_image, rag_system):
         
         if similar_cases:
             best_match = similar_cases[0]
-            actual_disease = rag_system.extract_disease_name(best_match['report'])
+            actual_disease = best_match['disease']
             
             # Generate professional report based on disease
             professional_report = rag_system.generate_professional_report(actual_disease, similar_cases[1:3])
@@ -398,10 +495,7 @@ def process_image_with_rag(uploaded_image, rag_system):
         logger.error(f"Error processing image: {e}")
         return None
 
-def generate_enhanced_report(base_result, rag_system):
-    disease = base_result['disease']
-    disease_info = rag_system.search_similar_reports(f"{disease} findings symptoms treatment", k=5)
-    
+def generate_enhanced_report(disease_info):
     enhanced_info = {'clinical_context': [], 'differential_diagnosis': [], 'recommendations': []}
     
     for case in disease_info:
@@ -415,7 +509,7 @@ def main():
     
     rag_system = get_rag_system()
     
-    if not os.path.exists(rag_system.index_path):
+    if not rag_system.index_files_exist():
         with st.spinner("Building FAISS index for the first time. This may take a few minutes..."):
             rag_system.build_faiss_index()
     else:
@@ -461,6 +555,13 @@ def main():
                 result = process_image_with_rag(uploaded_file, rag_system)
                 
                 if result:
+                    # Both follow-up queries depend on the detected disease, so they share one search
+                    enhancement_results, disease_results = rag_system.search_similar_reports_batch([
+                        f"{result['disease']} findings symptoms treatment",
+                        f"What are the key features of {result['disease']} in chest X-rays?"
+                    ], k=5)
+                    disease_results = disease_results[:3]
+                    
                     with col2:
                         if show_debug:
                             with st.expander("🐞 Debug Information"):
@@ -480,7 +581,7 @@ def main():
                         if result['similar_cases']:
                             with st.expander("🔍 Similar Cases from Database", expanded=True):
                                 for i, case in enumerate(result['similar_cases'], 1):
-                                    case_disease = rag_system.extract_disease_name(case['report'])
+                                    case_disease = case['disease']
                                     st.markdown(f"""
                                     **📊 Similar Case {i}** (Relevance Score: {case['similarity_score']:.3f})
                                     - **🏥 Disease:** {case_disease}
@@ -489,11 +590,15 @@ def main():
                                     """)
                                     st.markdown("---")
                         
-                        enhanced_info = generate_enhanced_report(result, rag_system)
+                        enhanced_info = generate_enhanced_report(enhancement_results)
                         
-                        img_byte_arr = io.BytesIO()
-                        Image.open(uploaded_file).save(img_byte_arr, format='PNG')
-                        img_byte_arr = img_byte_arr.getvalue()
+                        # The PDF embeds PNG/JPEG bytes as-is; only re-encode other formats
+                        if uploaded_file.type in ("image/png", "image/jpeg"):
+                            img_byte_arr = uploaded_file.getvalue()
+                        else:
+                            img_byte_arr = io.BytesIO()
+                            Image.open(uploaded_file).save(img_byte_arr, format='PNG')
+                            img_byte_arr = img_byte_arr.getvalue()
                         
                         try:
                             if hasattr(template, 'create_enhanced_xray_report_pdf'):
@@ -525,12 +630,10 @@ def main():
             if 'result' in locals() and result:
                 st.markdown("### 🧠 Knowledge-Enhanced Analysis")
                 st.markdown("#### 🔬 Disease-Specific Knowledge")
-                disease_query = f"What are the key features of {result['disease']} in chest X-rays?"
-                disease_results = rag_system.search_similar_reports(disease_query, k=3)
                 
                 if disease_results:
                     for i, res in enumerate(disease_results, 1):
-                        res_disease = rag_system.extract_disease_name(res['report'])
+                        res_disease = res['disease']
                         with st.expander(f"📚 Knowledge Source {i} (Relevance: {res['similarity_score']:.3f})", expanded=(i==1)):
                             st.markdown(f"**Disease Type:** {res_disease}")
                             st.markdown(f"**Case ID:** {res['id']}")